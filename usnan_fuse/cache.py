@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
+import queue
+import re
 import shutil
 import tempfile
 import threading
+import uuid
 from pathlib import Path
 from typing import List, Optional, Union
 
@@ -16,6 +21,57 @@ logger = logging.getLogger(__name__)
 _DEFAULT_CACHE_DIR = Path(user_cache_dir("usnan-fuse", ensure_exists=True))
 _DEFAULT_MAX_BYTES = 4 * 1024 * 1024 * 1024  # 4 GB
 
+# Dataset cache dirs are named by numeric id; everything else (temp
+# downloads, pending deletions, the access index) is skipped.
+_DATASET_ID_RE = re.compile(r"\d+$")
+
+
+def _dir_nonempty(path: Union[str, Path]) -> bool:
+    """True if *path* is a directory with at least one entry.
+
+    A single scandir probe — unlike ``any(path.iterdir())`` it allocates
+    no intermediate ``Path`` for the first child.
+    """
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+# st_blocks is POSIX-only; on platforms without it fall back to st_size.
+_HAS_ST_BLOCKS = hasattr(os.stat(os.curdir), "st_blocks")
+
+
+def _scandir_size(path: Union[str, Path]) -> int:
+    """Total on-disk size of all files under *path* in bytes.
+
+    Uses ``os.scandir`` rather than ``Path.rglob`` so each entry costs a
+    single cached ``stat`` from the directory read instead of separate
+    ``is_file()``/``stat()`` syscalls per file.  Symlinks are skipped.
+    Sizes are counted as ``st_blocks * 512`` (what the filesystem
+    actually allocates and reclaims, matching ``du``) rather than
+    ``st_size``, so eviction accounting doesn't undercount block
+    rounding on many small files.
+    """
+    total = 0
+    stack = [str(path)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        total += st.st_blocks * 512 if _HAS_ST_BLOCKS else st.st_size
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except PermissionError:
+            pass
+    return total
+
 
 class DownloadCache:
     """Thread-safe, on-disk cache of downloaded dataset contents.
@@ -32,42 +88,101 @@ class DownloadCache:
     ):
         self._root = Path(cache_dir) if cache_dir else _DEFAULT_CACHE_DIR
         self._root.mkdir(parents=True, exist_ok=True)
+        # Resolved once; path lookups only need string normalization.
+        self._root_str = str(self._root.resolve())
         self._max_bytes = max_bytes
-        # Per-dataset locks prevent concurrent downloads of the same dataset.
-        self._locks: dict[int, threading.Lock] = {}
+        # A fixed table of stripe locks prevents concurrent downloads of
+        # the same dataset.  Unrelated datasets may occasionally share a
+        # stripe (and serialize), but the table never grows and lookups
+        # need no global lock.
+        self._stripes = [threading.Lock() for _ in range(64)]
         self._global_lock = threading.Lock()
+        # dataset dir name → size in bytes, populated lazily so eviction
+        # checks don't have to re-walk every cached dataset.  Guarded by
+        # _global_lock.
+        self._sizes: dict[str, int] = {}
+        # dataset dir name → monotonic access counter, so eviction is
+        # true LRU (directory mtime only changes on download, not on
+        # reads).  Persisted to .access.json so recency survives
+        # remounts.  Touched on every path resolution, so it gets its
+        # own lock — _global_lock can be held across eviction accounting
+        # and must never stall the FUSE hot path.
+        self._access: dict[str, int] = {}
+        self._tick = 0
+        self._access_lock = threading.Lock()
+        self._access_file = self._root / ".access.json"
+        self._load_access()
+        # Deleting a multi-GB dataset is seconds of unlink syscalls, so
+        # victims are renamed aside and rmtree'd by a background worker
+        # instead of blocking the downloader.
+        self._evict_q: queue.Queue = queue.Queue()
+        self._evictor = threading.Thread(
+            target=self._evict_worker, name="usnan-fuse-evictor", daemon=True
+        )
+        self._evictor.start()
+        # Re-queue any victims left behind by a previous crash
+        for child in self._root.glob(".pending-rm-*"):
+            self._evict_q.put(child)
 
     def _lock_for(self, dataset_id: int) -> threading.Lock:
-        with self._global_lock:
-            if dataset_id not in self._locks:
-                self._locks[dataset_id] = threading.Lock()
-            return self._locks[dataset_id]
+        return self._stripes[dataset_id & 63]
+
+    def _touch_access(self, dataset_id: int) -> None:
+        """Record an access to *dataset_id* for LRU eviction ordering."""
+        with self._access_lock:
+            self._tick += 1
+            self._access[str(dataset_id)] = self._tick
+
+    def _load_access(self) -> None:
+        try:
+            with open(self._access_file) as f:
+                self._access = {str(k): int(v) for k, v in json.load(f).items()}
+            self._tick = max(self._access.values(), default=0)
+        except (OSError, ValueError):
+            self._access = {}
+
+    def _save_access(self) -> None:
+        """Persist access counters.  The file write happens lock-free."""
+        with self._access_lock:
+            snapshot = dict(self._access)
+        try:
+            with open(self._access_file, "w") as f:
+                json.dump(snapshot, f)
+        except OSError:
+            logger.debug("Could not persist access index", exc_info=True)
 
     def _dataset_dir(self, dataset_id: int) -> Path:
         return self._root / str(dataset_id)
 
     def is_cached(self, dataset_id: int) -> bool:
-        d = self._dataset_dir(dataset_id)
-        return d.is_dir() and any(d.iterdir())
+        return _dir_nonempty(self._dataset_dir(dataset_id))
 
     def cached_size(self, dataset_id: int) -> Optional[int]:
         """Return total size in bytes of a cached dataset, or None if not cached."""
         d = self._dataset_dir(dataset_id)
-        if not d.is_dir() or not any(d.iterdir()):
+        if not _dir_nonempty(d):
             return None
-        return self._dir_size(d)
+        return _scandir_size(d)
 
     def ensure_downloaded(self, client, dataset_id: int) -> Path:
         """Download the dataset if not already cached. Thread-safe.
 
         Returns the path to the cached dataset directory.
         """
+        self._touch_access(dataset_id)
+        ds_dir = self._dataset_dir(dataset_id)
+
+        # Lock-free fast path: cache hits are the overwhelmingly common
+        # case and need no synchronization — a single scandir probe tells
+        # us the dataset is fully in place.
+        if _dir_nonempty(ds_dir):
+            return ds_dir
+
         lock = self._lock_for(dataset_id)
         with lock:
-            ds_dir = self._dataset_dir(dataset_id)
-            if ds_dir.is_dir() and any(ds_dir.iterdir()):
-                # Touch the directory so LRU tracking stays current
-                ds_dir.touch()
+            # Double-check under the lock: another thread may have
+            # finished the download while we waited.
+            if _dir_nonempty(ds_dir):
                 return ds_dir
 
             # Clean up any partial previous download
@@ -84,13 +199,15 @@ class DownloadCache:
             ))
             try:
                 client.datasets.download([dataset_id], tmp_dir)
-                self._unwrap(tmp_dir)
-                tmp_dir.rename(ds_dir)
+                self._install(tmp_dir, ds_dir)
             except Exception:
                 if tmp_dir.exists():
                     shutil.rmtree(tmp_dir)
                 raise
             logger.info("Dataset %d cached at %s", dataset_id, ds_dir)
+            size = _scandir_size(ds_dir)
+            with self._global_lock:
+                self._sizes[ds_dir.name] = size
 
         # Evict outside the per-dataset lock to avoid holding it during IO
         self._evict_if_needed()
@@ -98,51 +215,71 @@ class DownloadCache:
 
     def list_entries(self, dataset_id: int, subpath: str = "") -> List[Path]:
         """List immediate children of a (sub)directory inside a cached dataset."""
+        self._touch_access(dataset_id)
         ds_dir = self._dataset_dir(dataset_id)
         target = ds_dir / subpath if subpath else ds_dir
-        if not target.is_dir():
+        try:
+            with os.scandir(target) as it:
+                return [Path(e.path) for e in sorted(it, key=lambda e: e.name)]
+        except (NotADirectoryError, FileNotFoundError):
             return []
-        return sorted(target.iterdir())
 
     def resolve_path(self, dataset_id: int, subpath: str) -> Optional[Path]:
         """Resolve a subpath inside a cached dataset to a real filesystem path.
 
         Returns ``None`` if the path does not exist.
         """
-        ds_dir = self._dataset_dir(dataset_id)
-        full = (ds_dir / subpath).resolve()
-        # Prevent path traversal
-        if not str(full).startswith(str(ds_dir.resolve())):
+        full = self.resolve_path_str(dataset_id, subpath)
+        return Path(full) if full is not None else None
+
+    def resolve_path_str(self, dataset_id: int, subpath: str) -> Optional[str]:
+        """Like :meth:`resolve_path`, but returns a plain string.
+
+        The FUSE hot paths feed the result straight to ``os.stat`` and
+        ``os.open``, so skipping the ``Path`` allocation saves an object
+        and an ``__fspath__`` round-trip per operation.
+        """
+        self._touch_access(dataset_id)
+        ds_prefix = os.path.join(self._root_str, str(dataset_id))
+        full = os.path.normpath(os.path.join(ds_prefix, subpath))
+        # Prevent path traversal — normpath collapses any "..", so a
+        # prefix check against this dataset's own directory is sufficient
+        # without a resolve() syscall walk.
+        if full != ds_prefix and not full.startswith(ds_prefix + os.sep):
             return None
-        return full if full.exists() else None
+        return full if os.path.lexists(full) else None
 
     # ------------------------------------------------------------------
     # Post-download unwrapping
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _unwrap(ds_dir: Path) -> None:
-        """Flatten the ZIP download structure.
+    def _install(tmp_dir: Path, ds_dir: Path) -> None:
+        """Move the downloaded contents into their final location.
 
         The SDK downloads a ZIP containing ``experiments.csv`` and a single
-        experiment subfolder.  We remove the CSV and move the subfolder's
-        contents up so the user sees the experiment data directly.
+        experiment subfolder.  We remove the CSV and rename the subfolder
+        itself into place, so the user sees the experiment data directly —
+        two renames total instead of one per file.  If the structure is
+        unexpected, the download is shipped as-is.
         """
         # Remove experiments.csv (the per-download manifest)
-        csv = ds_dir / "experiments.csv"
-        if csv.exists():
-            csv.unlink()
+        try:
+            os.unlink(tmp_dir / "experiments.csv")
+        except FileNotFoundError:
+            pass
 
-        # Find the single remaining subdirectory
-        subdirs = [p for p in ds_dir.iterdir() if p.is_dir()]
-        if len(subdirs) != 1:
-            return  # unexpected structure — leave as-is
+        # If exactly one subdirectory remains, it IS the dataset — rename
+        # it into place and drop the now-empty wrapper.
+        with os.scandir(tmp_dir) as it:
+            entries = list(it)
+        if len(entries) == 1 and entries[0].is_dir(follow_symlinks=False):
+            os.rename(entries[0].path, ds_dir)
+            os.rmdir(tmp_dir)
+            return
 
-        experiment_dir = subdirs[0]
-        # Move all contents up into ds_dir
-        for child in list(experiment_dir.iterdir()):
-            child.rename(ds_dir / child.name)
-        experiment_dir.rmdir()
+        # Unexpected structure — leave the contents unmodified.
+        os.rename(tmp_dir, ds_dir)
 
     # ------------------------------------------------------------------
     # Size-based eviction
@@ -151,37 +288,95 @@ class DownloadCache:
     @staticmethod
     def _dir_size(path: Path) -> int:
         """Total size of all files under *path* in bytes."""
-        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        return _scandir_size(path)
 
     def _evict_if_needed(self) -> None:
         """Remove least-recently-accessed dataset dirs until under max_bytes."""
+        # Collect candidate dataset dirs and backfill any unknown sizes
+        # before taking _global_lock — the tree walks can take seconds on
+        # the first post-mount eviction and must not block downloaders.
+        candidates = []
+        for child in self._root.iterdir():
+            name = child.name
+            # Hidden entries (.dl-* temp dirs, .pending-rm-* victims,
+            # .access.json) are the common reject — test them first.
+            if name.startswith(".") or not _DATASET_ID_RE.match(name):
+                continue
+            if not child.is_dir():
+                continue
+            candidates.append(child)
+
+        with self._global_lock:
+            known = set(self._sizes)
+        backfill = {
+            child.name: _scandir_size(child)
+            for child in candidates
+            if child.name not in known
+        }
+        with self._access_lock:
+            access = dict(self._access)
+
+        evicted = False
         with self._global_lock:
-            # Collect (mtime, size, path) for each cached dataset directory
-            entries = []
-            for child in self._root.iterdir():
-                if not child.is_dir():
-                    continue
-                try:
-                    int(child.name)
-                except ValueError:
-                    continue  # skip non-dataset dirs
-                size = self._dir_size(child)
-                mtime = child.stat().st_mtime
-                entries.append((mtime, size, child))
+            for name, size in backfill.items():
+                # Re-check before adopting: the dir may have been evicted
+                # (and its size entry popped) while the walk ran, and a
+                # blind setdefault would resurrect it as a phantom victim.
+                if name not in self._sizes and os.path.isdir(self._root / name):
+                    self._sizes[name] = size
+
+            # Collect (access_tick, size, path) for each cached dataset
+            # dir; anything evicted concurrently has lost its size entry.
+            entries = [
+                (access.get(child.name, 0), self._sizes[child.name], child)
+                for child in candidates
+                if child.name in self._sizes
+            ]
 
             total = sum(size for _, size, _ in entries)
-            if total <= self._max_bytes:
-                return
-
-            # Sort oldest first
-            entries.sort(key=lambda e: e[0])
-            for mtime, size, path in entries:
-                if total <= self._max_bytes:
-                    break
-                logger.info(
-                    "Evicting cached dataset %s (%.1f MB) to stay under limit",
-                    path.name,
-                    size / (1024 * 1024),
-                )
-                shutil.rmtree(path)
-                total -= size
+            if total > self._max_bytes:
+                # Sort least-recently-accessed first
+                entries.sort(key=lambda e: e[0])
+                for _, size, path in entries:
+                    if total <= self._max_bytes:
+                        break
+                    logger.info(
+                        "Evicting cached dataset %s (%.1f MB) to stay under limit",
+                        path.name,
+                        size / (1024 * 1024),
+                    )
+                    # Rename the victim aside so a concurrent re-download
+                    # of the same dataset can't collide with the dying
+                    # path, then let the background worker do the slow
+                    # rmtree.
+                    doomed = self._root / f".pending-rm-{uuid.uuid4().hex}"
+                    try:
+                        os.rename(path, doomed)
+                    except OSError:
+                        # Lost victim — evicted concurrently or deleted
+                        # externally; drop its stale accounting and move on.
+                        self._sizes.pop(path.name, None)
+                        with self._access_lock:
+                            self._access.pop(path.name, None)
+                        total -= size
+                        continue
+                    self._sizes.pop(path.name, None)
+                    with self._access_lock:
+                        self._access.pop(path.name, None)
+                    total -= size
+                    evicted = True
+                    self._evict_q.put(doomed)
+
+        if evicted:
+            self._save_access()
+
+    def _evict_worker(self) -> None:
+        """Background thread: delete evicted dataset dirs off the hot path."""
+        while True:
+            doomed = self._evict_q.get()
+            try:
+                shutil.rmtree(doomed)
+            except OSError:
+                logger.warning("Failed to remove evicted dir %s", doomed, exc_info=True)
+            finally:
+                self._evict_q.task_done()
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
@@ -12,7 +14,7 @@ from typing import Any, Dict, List, Optional, Union
 from usnan.models.search import SearchConfig
 
 from .filters import RawSearchConfig
-from .utils import deduplicate_names, parse_iso_timestamp
+from .utils import deduplicate_names, parse_iso_timestamps
 
 logger = logging.getLogger(__name__)
 
@@ -57,12 +59,43 @@ class DatasetCatalog:
     def __init__(self, client, ttl: float = 300.0):
         self._client = client
         self._ttl = ttl
-        self._cache: Dict[CategoryKey, CachedListing] = {}
+        # Listings are kept in an access-ordered dict capped by
+        # _cache_capacity() so a long-running mount with many custom
+        # directories can't accumulate listings without bound.
+        self._cache: "OrderedDict[CategoryKey, CachedListing]" = OrderedDict()
         self._custom_dirs: Dict[str, CustomDirectory] = {}
+        # Cached frozenset of available categories, keyed by auth state;
+        # rebuilt when a custom directory is registered.
+        self._category_set_cache: Optional[tuple] = None
+        # Monotonic per-category refresh counters, so consumers can tell
+        # whether derived data (e.g. rendered readdir listings) is stale.
+        self._versions: Dict[CategoryKey, int] = {}
+        # One refresh lock per category so concurrent FUSE threads don't
+        # duplicate the (expensive) fetch; _meta_lock guards the dict itself.
+        self._refresh_locks: Dict[CategoryKey, threading.Lock] = {}
+        self._meta_lock = threading.Lock()
+        # Search configs are constant per category (only PUBLIC embeds the
+        # current time), so build them once instead of on every refresh.
+        self._static_configs: Dict[CategoryKey, RawSearchConfig] = {
+            Category.PUBLISHED: self._published_config(),
+            Category.LAB_GROUP: self._lab_group_config(),
+            Category.MY_DATASETS: self._my_datasets_config(),
+        }
+        self._public_template = SearchConfig(records=10000)
 
     def add_custom_directory(self, name: str, filters: List[Dict[str, Any]]) -> None:
         """Register a custom directory with the given search filters."""
         self._custom_dirs[name] = CustomDirectory(name=name, filters=filters)
+        cfg = RawSearchConfig(records=10000)
+        for f in filters:
+            cfg.add_raw_filter(
+                f["field"],
+                value=f.get("value"),
+                match_mode=f.get("match_mode", "equals"),
+                operator=f.get("operator", "AND"),
+            )
+        self._static_configs[name] = cfg
+        self._category_set_cache = None
         logger.info("Registered custom directory: %s", name)
 
     def available_categories(self) -> List[CategoryKey]:
@@ -82,15 +115,61 @@ class DatasetCatalog:
         cats.extend(self._custom_dirs.keys())
         return cats
 
+    def available_category_set(self) -> frozenset:
+        """Frozenset of :meth:`available_categories` for O(1) membership tests.
+
+        FUSE checks category membership on every operation, so the set is
+        cached per auth state rather than rebuilt as a list each call.
+        """
+        auth = getattr(self._client, "_auth", None)
+        authed = bool(auth and auth.authenticated)
+        cached = self._category_set_cache
+        if cached is not None and cached[0] == authed:
+            return cached[1]
+        cats = frozenset(self.available_categories())
+        self._category_set_cache = (authed, cats)
+        return cats
+
     def category_display_name(self, category: CategoryKey) -> str:
         """Return the display name for a category (used as folder name)."""
         if isinstance(category, Category):
             return category.value
         return category  # custom dirs use their name directly
 
+    def _refresh_lock_for(self, category: CategoryKey) -> threading.Lock:
+        with self._meta_lock:
+            lock = self._refresh_locks.get(category)
+            if lock is None:
+                lock = self._refresh_locks[category] = threading.Lock()
+            return lock
+
     def get_listing(self, category: CategoryKey) -> CachedListing:
         """Return a (possibly cached) listing for *category*."""
         cached = self._cache.get(category)
+        if cached and (time.time() - cached.fetched_at) < self._ttl:
+            try:
+                self._cache.move_to_end(category)
+            except KeyError:
+                pass  # concurrently evicted — the listing is still usable
+            return cached
+
+        lock = self._refresh_lock_for(category)
+        if cached is not None:
+            # Stale-while-revalidate: if another thread is already
+            # refreshing, serve the stale listing rather than blocking.
+            if not lock.acquire(blocking=False):
+                return cached
+        else:
+            lock.acquire()
+        try:
+            return self._refresh_listing(category)
+        finally:
+            lock.release()
+
+    def _refresh_listing(self, category: CategoryKey) -> CachedListing:
+        """Fetch and cache a fresh listing.  Caller holds the refresh lock."""
+        # Re-check under the lock: another thread may have just refreshed.
+        cached = self._cache.get(category)
         if cached and (time.time() - cached.fetched_at) < self._ttl:
             return cached
 
@@ -99,22 +178,28 @@ class DatasetCatalog:
         datasets = list(self._fetch(category))
         name_map = deduplicate_names(datasets)
 
-        folder_lookup = {}
-        timestamps: Dict[str, float] = {}
         version_map: Dict[str, Dict[str, int]] = {}
 
-        for ds in datasets:
-            folder_name = name_map[ds.id]
-            folder_lookup[folder_name] = ds
-            timestamps[folder_name] = parse_iso_timestamp(
-                getattr(ds, "experiment_start_time", None)
-            )
+        # Parse all timestamps in one batch (repeats are memoized) rather
+        # than one datetime round-trip per dataset.
+        parsed_times = parse_iso_timestamps(
+            getattr(ds, "experiment_start_time", None) for ds in datasets
+        )
+
+        # deduplicate_names guarantees unique folder names, so both maps
+        # can be built as C-level comprehensions; parsed_times is aligned
+        # with datasets and therefore with folder_lookup's insertion order.
+        folder_lookup = {name_map[ds.id]: ds for ds in datasets}
+        timestamps: Dict[str, float] = dict(zip(folder_lookup, parsed_times))
 
-            # For PUBLISHED, build the version subfolder mapping
-            if category == Category.PUBLISHED:
+        # Only PUBLISHED has version subfolders; build them in a dedicated
+        # pass instead of re-testing the category once per dataset.
+        if category == Category.PUBLISHED:
+            for folder_name, ds in folder_lookup.items():
                 versions: Dict[str, int] = {"Original": ds.id}
-                if ds.versions:
-                    for v in ds.versions:
+                ds_versions = ds.versions
+                if ds_versions:
+                    for v in ds_versions:
                         versions[f"v{v.version}"] = v.dataset.id
                 version_map[folder_name] = versions
 
@@ -127,8 +212,19 @@ class DatasetCatalog:
             fetched_at=time.time(),
         )
         self._cache[category] = listing
+        self._cache.move_to_end(category)
+        while len(self._cache) > self._cache_capacity():
+            self._cache.popitem(last=False)
+        self._versions[category] = self._versions.get(category, 0) + 1
         return listing
 
+    def version(self, category: CategoryKey) -> int:
+        """Monotonic counter incremented each time *category* is refreshed."""
+        return self._versions.get(category, 0)
+
+    def _cache_capacity(self) -> int:
+        return max(16, 2 * len(self._custom_dirs) + 4)
+
     def get_dataset_by_folder_name(self, category: CategoryKey, name: str):
         """Look up a Dataset object by its display folder name."""
         listing = self.get_listing(category)
@@ -146,52 +242,48 @@ class DatasetCatalog:
         yield from self._client.datasets.search(config)
 
     def _build_config(self, category: CategoryKey):
+        # Static categories (and custom dirs) are prebuilt once.
+        config = self._static_configs.get(category)
+        if config is not None:
+            return config
+
         if category == Category.PUBLIC:
+            # Only the timestamp filter changes between refreshes.
             now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-            return SearchConfig(records=10000).add_filter(
+            return self._public_template.clone().add_filter(
                 "public_time", value=now, match_mode="lessThan"
             )
 
-        if category == Category.PUBLISHED:
-            # Fetch original datasets (version=None) that have published versions
-            cfg = RawSearchConfig(records=10000)
-            cfg.add_raw_filter(
-                "_has_published_version", value=True, match_mode="equals"
-            )
-            cfg.add_raw_filter("version", value=True, match_mode="isNull")
-            return cfg
-
-        if category == Category.LAB_GROUP:
-            cfg = RawSearchConfig(records=10000)
-            cfg.add_raw_filter(
-                "_perm_reason", value="project", match_mode="array-includes", operator="OR"
-            )
-            cfg.add_raw_filter(
-                "_perm_reason", value="lab-group", match_mode="array-includes", operator="OR"
-            )
-            cfg.add_raw_filter(
-                "_perm_reason", value="own-data", match_mode="array-includes", operator="OR"
-            )
-            return cfg
+        return None
 
-        if category == Category.MY_DATASETS:
-            cfg = RawSearchConfig(records=10000)
-            cfg.add_raw_filter(
-                "_perm_reason", value="own-data", match_mode="array-includes"
-            )
-            return cfg
-
-        # Custom directory
-        if isinstance(category, str) and category in self._custom_dirs:
-            custom = self._custom_dirs[category]
-            cfg = RawSearchConfig(records=10000)
-            for f in custom.filters:
-                cfg.add_raw_filter(
-                    f["field"],
-                    value=f.get("value"),
-                    match_mode=f.get("match_mode", "equals"),
-                    operator=f.get("operator", "AND"),
-                )
-            return cfg
+    @staticmethod
+    def _published_config() -> RawSearchConfig:
+        # Fetch original datasets (version=None) that have published versions
+        cfg = RawSearchConfig(records=10000)
+        cfg.add_raw_filter(
+            "_has_published_version", value=True, match_mode="equals"
+        )
+        cfg.add_raw_filter("version", value=True, match_mode="isNull")
+        return cfg
+
+    @staticmethod
+    def _lab_group_config() -> RawSearchConfig:
+        cfg = RawSearchConfig(records=10000)
+        cfg.add_raw_filter(
+            "_perm_reason", value="project", match_mode="array-includes", operator="OR"
+        )
+        cfg.add_raw_filter(
+            "_perm_reason", value="lab-group", match_mode="array-includes", operator="OR"
+        )
+        cfg.add_raw_filter(
+            "_perm_reason", value="own-data", match_mode="array-includes", operator="OR"
+        )
+        return cfg
 
-        return None
+    @staticmethod
+    def _my_datasets_config() -> RawSearchConfig:
+        cfg = RawSearchConfig(records=10000)
+        cfg.add_raw_filter(
+            "_perm_reason", value="own-data", match_mode="array-includes"
+        )
+        return cfg
@@ -122,4 +122,11 @@ def main(argv: list[str] | None = None) -> None:
 
     logging.getLogger(__name__).info("Mounting on %s", args.mountpoint)
 
-    FUSE(fs, args.mountpoint, foreground=args.foreground, ro=True, nothreads=False)
+    FUSE(
+        fs,
+        args.mountpoint,
+        foreground=args.foreground,
+        ro=True,
+        nothreads=False,
+        **NMRHubFS.default_fuse_options(),
+    )
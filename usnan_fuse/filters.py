@@ -13,7 +13,6 @@ RawSearchConfig implements the same interface that DatasetsEndpoint.search() use
 
 from __future__ import annotations
 
-import copy
 import json
 from typing import Any, Dict, List
 
@@ -21,12 +20,20 @@ from typing import Any, Dict, List
 class RawFilterMetadata:
     """A single raw filter entry."""
 
-    __slots__ = ("value", "match_mode", "operator")
+    __slots__ = ("value", "match_mode", "operator", "_json")
 
     def __init__(self, value: Any, match_mode: str = "equals", operator: str = "AND"):
         self.value = value
         self.match_mode = match_mode
         self.operator = operator
+        # Serialized once at construction; build() assembles the filters
+        # blob from these fragments instead of re-walking nested dicts
+        # through json.dumps on every call.
+        self._json = '{"value":%s,"matchMode":%s,"operator":%s}' % (
+            json.dumps(value),
+            json.dumps(match_mode),
+            json.dumps(operator),
+        )
 
     def to_dict(self) -> Dict[str, Any]:
         return {"value": self.value, "matchMode": self.match_mode, "operator": self.operator}
@@ -51,6 +58,9 @@ class RawSearchConfig:
         self.sort_order = sort_order
         self.sort_field = sort_field
         self._filters: Dict[str, List[RawFilterMetadata]] = {}
+        # Serialized filters, invalidated whenever a filter is added so
+        # repeated build() calls (e.g. during pagination) reuse the JSON.
+        self._built_filters: str | None = None
 
     def add_raw_filter(
         self,
@@ -66,15 +76,18 @@ class RawSearchConfig:
         """
         entry = RawFilterMetadata(value=value, match_mode=match_mode, operator=operator)
         self._filters.setdefault(field, []).append(entry)
+        self._built_filters = None
         return self
 
     def build(self) -> Dict[str, Any]:
         """Return a dict in the same shape as ``SearchConfig.build()``."""
-        filters_dict = {
-            key: [f.to_dict() for f in value] for key, value in self._filters.items()
-        }
+        if self._built_filters is None:
+            self._built_filters = "{%s}" % ",".join(
+                "%s:[%s]" % (json.dumps(key), ",".join(f._json for f in value))
+                for key, value in self._filters.items()
+            )
         return {
-            "filters": json.dumps(filters_dict),
+            "filters": self._built_filters,
             "offset": self.offset,
             "sort_order": self.sort_order,
             "sort_field": self.sort_field,
@@ -89,5 +102,10 @@ class RawSearchConfig:
             sort_order=self.sort_order,
             sort_field=self.sort_field,
         )
-        new._filters = copy.deepcopy(self._filters)
+        # Explicit reconstruction — far cheaper than copy.deepcopy for
+        # these small, __slots__-based objects.
+        new._filters = {
+            key: [RawFilterMetadata(f.value, f.match_mode, f.operator) for f in value]
+            for key, value in self._filters.items()
+        }
         return new
@@ -6,9 +6,11 @@ import errno
 import logging
 import os
 import stat
+import threading
 import time
 from typing import Optional
 
+from cachetools import LRUCache, TTLCache
 from fuse import FuseOSError, Operations
 
 from .cache import DownloadCache
@@ -16,6 +18,16 @@ from .catalog import Category, CategoryKey, DatasetCatalog
 
 logger = logging.getLogger(__name__)
 
+# Files at or below this size are read fully into memory on open() and
+# served without an OS file descriptor.
+_SMALL_FILE_LIMIT = 64 * 1024
+
+# The mount is read-only; every write operation shares this raiser.
+# The exception is built per call — re-raising one shared instance
+# would chain traceback frames onto it forever.
+def _erofs(*args, **kwargs):
+    raise FuseOSError(errno.EROFS)
+
 
 class NMRHubFS(Operations):
     """Read-only FUSE filesystem that presents NMRHub datasets as directories.
@@ -39,15 +51,79 @@ class NMRHubFS(Operations):
         self._catalog = catalog
         self._cache = cache
         self._mount_time = time.time()
-        # Map of open file descriptors → OS file descriptors
-        self._open_fds: dict[int, int] = {}
+        # Map of open file descriptors → OS file descriptors (None for
+        # handles served inline from _inline_data)
+        self._open_fds: dict[int, Optional[int]] = {}
         self._next_fh = 1
+        # Released handle numbers are recycled so _open_fds stays small
+        # on long-lived mounts instead of growing with every open ever.
+        # fusepy runs multithreaded, so allocation and recycling share a
+        # lock — check-then-pop on the free list isn't atomic.
+        self._free_fhs: list[int] = []
+        self._fh_lock = threading.Lock()
+        # fh → full contents for small files, plus an LRU of contents by
+        # real path so re-opens skip the disk read too.
+        self._inline_data: dict[int, bytes] = {}
+        self._small_file_cache: LRUCache = LRUCache(maxsize=256)
+        # (category, dataset, subpath) → (catalog version, entry list)
+        self._readdir_cache: LRUCache = LRUCache(maxsize=2048)
+        # Shells probe many paths that never exist (.git, .DS_Store, …);
+        # remember recent misses briefly so they cost one dict probe.
+        self._neg_cache: TTLCache = TTLCache(maxsize=2048, ttl=5.0)
+        # (dataset folder, version label) → dataset id, rebuilt lazily
+        # when the PUBLISHED listing refreshes.
+        self._published_version_index: Optional[dict] = None
+        self._published_index_version = -1
+        # getattr is by far the hottest FUSE op; memoize its stat dicts
+        # briefly per path.  cachetools caches aren't thread-safe and
+        # fusepy runs multithreaded, so accesses go through _attr_lock.
+        self._attr_cache: TTLCache = TTLCache(maxsize=4096, ttl=30.0)
+        # Cached files are immutable once downloaded, so their stat dicts
+        # can be kept until the dataset is re-downloaded.  Shares
+        # _attr_lock with the attr cache.
+        self._stat_cache: LRUCache = LRUCache(maxsize=8192)
+        # FUSE path → resolved real file path, populated by getattr so the
+        # getattr → open → read triplet only walks the catalog once.
+        self._path_resolve_cache: LRUCache = LRUCache(maxsize=4096)
+        self._attr_lock = threading.Lock()
+        # Category name → CategoryKey; custom names are memoized on first
+        # resolution so the enum is never scanned per FUSE op.
+        self._name_to_category: dict = {cat.value: cat for cat in Category}
+        # uid/gid never change for the mount; fetch once instead of two
+        # syscalls per synthetic directory stat.
+        self._dir_stat_template = {
+            "st_mode": stat.S_IFDIR | 0o555,
+            "st_nlink": 2,
+            "st_uid": os.getuid(),
+            "st_gid": os.getgid(),
+            "st_size": 0,
+        }
+
+    @classmethod
+    def default_fuse_options(cls) -> dict:
+        """Recommended mount options for this filesystem.
+
+        The mount is read-only and cached dataset files are immutable, so
+        the kernel is told to cache dentries, attributes, and page-cache
+        contents aggressively instead of round-tripping to Python for
+        every stat.  Timeouts mirror the userspace attr/negative caches.
+        """
+        return {
+            "kernel_cache": True,
+            "auto_cache": True,
+            "entry_timeout": 60,
+            "attr_timeout": 30,
+            "negative_timeout": 5,
+            "max_read": 131072,
+            "max_readahead": 1048576,
+        }
 
     # ------------------------------------------------------------------
     # Path parsing
     # ------------------------------------------------------------------
 
     _SENTINEL = object()
+    _DOT_ENTRIES = (".", "..")
 
     def _parse_path(self, path: str):
         """Parse a FUSE path into its components.
@@ -59,30 +135,40 @@ class NMRHubFS(Operations):
           ``_SENTINEL`` (which will not match any ``Category`` member and
           will therefore be rejected by the FUSE operations).
         """
-        parts = path.strip("/").split("/") if path != "/" else []
-
-        category = None
-        dataset_name = None
-        subpath = None
+        # Split with find()-based slicing: only three components are ever
+        # needed, so there's no reason to build a full list and re-join
+        # the tail on every FUSE op.
+        if path == "/":
+            return None, None, None
+        s = path.strip("/")
+        if not s:
+            return None, None, None
+
+        i = s.find("/")
+        if i < 0:
+            cat_name, rest = s, None
+        else:
+            cat_name, rest = s[:i], s[i + 1:]
 
-        if len(parts) >= 1:
-            category = self._resolve_category(parts[0])
-            if category is None:
-                # Path has a top-level component that isn't a known category.
-                category = self._SENTINEL
-        if len(parts) >= 2:
-            dataset_name = parts[1]
-        if len(parts) >= 3:
-            subpath = "/".join(parts[2:])
+        category = self._resolve_category(cat_name)
+        if category is None:
+            # Path has a top-level component that isn't a known category.
+            category = self._SENTINEL
 
-        return category, dataset_name, subpath
+        if rest is None:
+            return category, None, None
+        j = rest.find("/")
+        if j < 0:
+            return category, rest, None
+        return category, rest[:j], rest[j + 1:]
 
     def _resolve_category(self, name: str) -> Optional[CategoryKey]:
-        for cat in Category:
-            if cat.value == name:
-                return cat
-        # Check custom directory names
-        if name in self._catalog.available_categories():
+        cat = self._name_to_category.get(name)
+        if cat is not None:
+            return cat
+        # Custom directory names resolve to themselves
+        if name in self._catalog.available_category_set():
+            self._name_to_category[name] = name
             return name
         return None
 
@@ -93,19 +179,14 @@ class NMRHubFS(Operations):
     def _dir_stat(self, mtime: Optional[float] = None) -> dict:
         t = mtime or self._mount_time
         return {
-            "st_mode": stat.S_IFDIR | 0o555,
-            "st_nlink": 2,
-            "st_uid": os.getuid(),
-            "st_gid": os.getgid(),
-            "st_size": 0,
+            **self._dir_stat_template,
             "st_atime": t,
             "st_mtime": t,
             "st_ctime": t,
         }
 
     @staticmethod
-    def _dir_stat_from_path(real_path) -> dict:
-        st = os.stat(real_path)
+    def _dir_stat_from_stat(st: os.stat_result) -> dict:
         return {
             "st_mode": stat.S_IFDIR | 0o555,
             "st_nlink": st.st_nlink,
@@ -118,8 +199,7 @@ class NMRHubFS(Operations):
         }
 
     @staticmethod
-    def _file_stat_from_path(real_path) -> dict:
-        st = os.stat(real_path)
+    def _file_stat_from_stat(st: os.stat_result) -> dict:
         return {
             "st_mode": stat.S_IFREG | 0o444,
             "st_nlink": 1,
@@ -133,6 +213,29 @@ class NMRHubFS(Operations):
             "st_ctime": st.st_ctime,
         }
 
+    def _stat_real(self, path: str, real) -> dict:
+        """Stat dict for a resolved cached path, from one ``os.stat``.
+
+        The single stat result drives both the dir/file dispatch and the
+        dict build; results are cached since cached datasets are
+        immutable, and file paths are recorded for ``open()`` reuse.
+        """
+        key = real
+        with self._attr_lock:
+            d = self._stat_cache.get(key)
+        if d is None:
+            st = os.stat(key)
+            if stat.S_ISDIR(st.st_mode):
+                d = self._dir_stat_from_stat(st)
+            else:
+                d = self._file_stat_from_stat(st)
+            with self._attr_lock:
+                self._stat_cache[key] = d
+        if stat.S_ISREG(d["st_mode"]):
+            with self._attr_lock:
+                self._path_resolve_cache[path] = real
+        return d
+
     def _resolve_dataset_id(self, category: CategoryKey, dataset_name: str) -> int:
         """Resolve a dataset folder name to its ID.
 
@@ -148,21 +251,61 @@ class NMRHubFS(Operations):
 
         Raises ``FuseOSError(ENOENT)`` if not found.  Does NOT download.
         """
-        listing = self._catalog.get_listing(Category.PUBLISHED)
-        versions = listing.version_map.get(dataset_name)
-        if versions is None or version_label not in versions:
+        version = self._catalog.version(Category.PUBLISHED)
+        index = self._published_version_index
+        if index is None or self._published_index_version != version:
+            listing = self._catalog.get_listing(Category.PUBLISHED)
+            # get_listing may have refreshed; record the counter it left
+            version = self._catalog.version(Category.PUBLISHED)
+            index = {
+                (folder, label): ds_id
+                for folder, versions in listing.version_map.items()
+                for label, ds_id in versions.items()
+            }
+            self._published_version_index = index
+            self._published_index_version = version
+
+        ds_id = index.get((dataset_name, version_label))
+        if ds_id is None:
             raise FuseOSError(errno.ENOENT)
-        return versions[version_label]
+        return ds_id
 
     def _download(self, dataset_id: int) -> None:
         """Ensure a dataset is downloaded (called only from ``open()``)."""
+        was_cached = self._cache.is_cached(dataset_id)
         self._cache.ensure_downloaded(self._client, dataset_id)
+        if not was_cached:
+            # Paths inside the dataset were ENOENT a moment ago; drop any
+            # memoized attributes so they become visible immediately.
+            with self._attr_lock:
+                self._attr_cache.clear()
+                self._stat_cache.clear()
+                self._path_resolve_cache.clear()
+                self._neg_cache.clear()
 
     # ------------------------------------------------------------------
     # FUSE operations — read-only
     # ------------------------------------------------------------------
 
     def getattr(self, path, fh=None):
+        with self._attr_lock:
+            if path in self._neg_cache:
+                raise FuseOSError(errno.ENOENT)
+            st = self._attr_cache.get(path)
+        if st is not None:
+            return st
+        try:
+            st = self._getattr_uncached(path)
+        except FuseOSError as e:
+            if e.errno == errno.ENOENT:
+                with self._attr_lock:
+                    self._neg_cache[path] = True
+            raise
+        with self._attr_lock:
+            self._attr_cache[path] = st
+        return st
+
+    def _getattr_uncached(self, path):
         category, dataset_name, subpath = self._parse_path(path)
 
         # Root
@@ -170,7 +313,7 @@ class NMRHubFS(Operations):
             return self._dir_stat()
 
         # Validate category
-        if category not in self._catalog.available_categories():
+        if category not in self._catalog.available_category_set():
             raise FuseOSError(errno.ENOENT)
 
         # /<category>
@@ -193,9 +336,11 @@ class NMRHubFS(Operations):
 
         # --- PUBLISHED: extra version directory level ---
         if category == Category.PUBLISHED:
-            parts = subpath.split("/", 1)
-            version_label = parts[0]
-            inner_path = parts[1] if len(parts) > 1 else None
+            j = subpath.find("/")
+            if j < 0:
+                version_label, inner_path = subpath, None
+            else:
+                version_label, inner_path = subpath[:j], subpath[j + 1:]
 
             # Validate version label exists (no download yet)
             versions = listing.version_map.get(dataset_name, {})
@@ -215,42 +360,68 @@ class NMRHubFS(Operations):
             # /<category>/<dataset>/<version>/<inner_path>
             # Only stat if already cached — don't trigger download
             ds_id = self._resolve_version_id(dataset_name, version_label)
-            real = self._cache.resolve_path(ds_id, inner_path)
+            real = self._cache.resolve_path_str(ds_id, inner_path)
             if real is None:
                 raise FuseOSError(errno.ENOENT)
-            if real.is_dir():
-                return self._dir_stat_from_path(real)
-            return self._file_stat_from_path(real)
+            return self._stat_real(path, real)
 
         # --- Standard categories ---
         # Only stat if already cached — don't trigger download
         ds_id = self._resolve_dataset_id(category, dataset_name)
-        real = self._cache.resolve_path(ds_id, subpath)
+        real = self._cache.resolve_path_str(ds_id, subpath)
         if real is None:
             raise FuseOSError(errno.ENOENT)
-
-        if real.is_dir():
-            return self._dir_stat_from_path(real)
-        return self._file_stat_from_path(real)
+        return self._stat_real(path, real)
 
     def readdir(self, path, fh):
         category, dataset_name, subpath = self._parse_path(path)
-        entries = [".", ".."]
 
-        # Root: list available categories
+        # Root: list available categories (cheap, and the set can change
+        # with auth state — not worth caching)
         if category is None:
-            for cat in self._catalog.available_categories():
-                entries.append(self._catalog.category_display_name(cat))
+            entries = [*self._DOT_ENTRIES]
+            entries.extend(
+                self._catalog.category_display_name(cat)
+                for cat in self._catalog.available_categories()
+            )
             return entries
 
-        if category not in self._catalog.available_categories():
+        if category not in self._catalog.available_category_set():
             raise FuseOSError(errno.ENOENT)
 
+        # Repeat browsing of the same directory is the common case;
+        # serve the rendered entry list as long as the category listing
+        # hasn't been refreshed since it was built.
+        version = self._catalog.version(category)
+        key = (category, dataset_name, subpath or "")
+        with self._attr_lock:
+            hit = self._readdir_cache.get(key)
+        if hit is not None and hit[0] == version:
+            ds_id, entries = hit[1], hit[2]
+            # Eviction doesn't bump the catalog version, so a dataset-
+            # content hit is only valid while the dataset is still on
+            # disk — one scandir probe; rebuild (re-downloading) if gone.
+            if ds_id is None or self._cache.is_cached(ds_id):
+                return entries
+
+        ds_id, entries = self._build_readdir(category, dataset_name, subpath)
+        with self._attr_lock:
+            self._readdir_cache[key] = (version, ds_id, entries)
+        return entries
+
+    def _build_readdir(self, category, dataset_name, subpath):
+        """Render a directory listing.
+
+        Returns ``(dataset_id, entries)``; *dataset_id* is ``None`` for
+        catalog-level listings that don't touch the download cache.
+        """
+        entries = [*self._DOT_ENTRIES]
+
         # /<category>: list dataset folders
         if dataset_name is None:
             listing = self._catalog.get_listing(category)
             entries.extend(listing.folder_lookup.keys())
-            return entries
+            return None, entries
 
         # --- PUBLISHED: extra version directory level ---
         if category == Category.PUBLISHED:
@@ -263,44 +434,65 @@ class NMRHubFS(Operations):
             if subpath is None:
                 # /<category>/<dataset>/ → list version subfolders
                 entries.extend(sorted(versions.keys()))
-                return entries
+                return None, entries
 
             # /<category>/<dataset>/<version>[/<inner>]
             # Triggers download on first access
-            parts = subpath.split("/", 1)
-            version_label = parts[0]
-            inner_path = parts[1] if len(parts) > 1 else ""
+            j = subpath.find("/")
+            if j < 0:
+                version_label, inner_path = subpath, ""
+            else:
+                version_label, inner_path = subpath[:j], subpath[j + 1:]
 
             ds_id = self._resolve_version_id(dataset_name, version_label)
             self._download(ds_id)
-            children = self._cache.list_entries(ds_id, inner_path)
-            for child in children:
-                entries.append(child.name)
-            return entries
+            entries.extend(
+                child.name for child in self._cache.list_entries(ds_id, inner_path)
+            )
+            return ds_id, entries
 
         # --- Standard categories ---
         # Triggers download on first access
         ds_id = self._resolve_dataset_id(category, dataset_name)
         self._download(ds_id)
-        children = self._cache.list_entries(ds_id, subpath or "")
-        for child in children:
-            entries.append(child.name)
-        return entries
+        entries.extend(
+            child.name for child in self._cache.list_entries(ds_id, subpath or "")
+        )
+        return ds_id, entries
 
     def open(self, path, flags):
+        # getattr has usually just resolved this exact path; reuse its
+        # result instead of re-walking catalog and cache.
+        with self._attr_lock:
+            real = self._path_resolve_cache.get(path)
+        if real is not None:
+            try:
+                return self._open_real(real)
+            except FileNotFoundError:
+                # The dataset was evicted since getattr resolved this
+                # path; drop the stale entry and fall through to a full
+                # resolution, which re-downloads.
+                with self._attr_lock:
+                    self._path_resolve_cache.pop(path, None)
+        return self._open_real(self._resolve_for_open(path))
+
+    def _resolve_for_open(self, path):
+        """Resolve a FUSE path to a real cached file, downloading if needed."""
         category, dataset_name, subpath = self._parse_path(path)
 
         if category is None or dataset_name is None or subpath is None:
             raise FuseOSError(errno.EISDIR)
 
-        if category not in self._catalog.available_categories():
+        if category not in self._catalog.available_category_set():
             raise FuseOSError(errno.ENOENT)
 
         # --- PUBLISHED: resolve version + inner path ---
         if category == Category.PUBLISHED:
-            parts = subpath.split("/", 1)
-            version_label = parts[0]
-            inner_path = parts[1] if len(parts) > 1 else None
+            j = subpath.find("/")
+            if j < 0:
+                version_label, inner_path = subpath, None
+            else:
+                version_label, inner_path = subpath[:j], subpath[j + 1:]
 
             if inner_path is None:
                 # Trying to open a version dir as a file
@@ -308,90 +500,96 @@ class NMRHubFS(Operations):
 
             ds_id = self._resolve_version_id(dataset_name, version_label)
             self._download(ds_id)
-            real = self._cache.resolve_path(ds_id, inner_path)
-            if real is None or real.is_dir():
-                raise FuseOSError(errno.ENOENT)
+            real = self._cache.resolve_path_str(ds_id, inner_path)
         else:
             # --- Standard categories ---
             ds_id = self._resolve_dataset_id(category, dataset_name)
             self._download(ds_id)
-            real = self._cache.resolve_path(ds_id, subpath)
-            if real is None or real.is_dir():
-                raise FuseOSError(errno.ENOENT)
+            real = self._cache.resolve_path_str(ds_id, subpath)
 
-        os_fd = os.open(str(real), os.O_RDONLY)
-        fh = self._next_fh
-        self._next_fh += 1
+        if real is None:
+            raise FuseOSError(errno.ENOENT)
+        return real
+
+    def _open_real(self, real) -> int:
+        """Allocate a file handle for an already-resolved real path."""
+        # One os.stat covers both the directory check (EISDIR, per POSIX,
+        # rather than the previous ENOENT) and the small-file size test.
+        key = real
+        st = os.stat(key)
+        if stat.S_ISDIR(st.st_mode):
+            raise FuseOSError(errno.EISDIR)
+
+        # Small files are returned inline from memory — no OS fd, and no
+        # per-read syscalls.
+        with self._attr_lock:
+            data = self._small_file_cache.get(key)
+        if data is None and st.st_size <= _SMALL_FILE_LIMIT:
+            with open(key, "rb") as f:
+                data = f.read()
+            with self._attr_lock:
+                self._small_file_cache[key] = data
+        os_fd = None if data is not None else os.open(key, os.O_RDONLY)
+
+        # Allocate the handle number only once the data or fd is in hand
+        # — an open that fails (e.g. the file was evicted after stat)
+        # must not leak a number from the free list.
+        with self._fh_lock:
+            if self._free_fhs:
+                fh = self._free_fhs.pop()
+            else:
+                fh = self._next_fh
+                self._next_fh += 1
+        if data is not None:
+            self._inline_data[fh] = data
         self._open_fds[fh] = os_fd
         return fh
 
     def read(self, path, size, offset, fh):
+        data = self._inline_data.get(fh)
+        if data is not None:
+            return data[offset:offset + size]
         os_fd = self._open_fds.get(fh)
         if os_fd is None:
             raise FuseOSError(errno.EBADF)
-        os.lseek(os_fd, offset, os.SEEK_SET)
-        return os.read(os_fd, size)
+        # Positional read: one syscall, and no shared-cursor hazard when
+        # the kernel issues parallel reads on the same handle.
+        return os.pread(os_fd, size, offset)
 
     def release(self, path, fh):
-        os_fd = self._open_fds.pop(fh, None)
-        if os_fd is not None:
+        self._inline_data.pop(fh, None)
+        with self._fh_lock:
+            known = fh in self._open_fds
+            if known:
+                os_fd = self._open_fds.pop(fh)
+                self._free_fhs.append(fh)
+        if known and os_fd is not None:
             os.close(os_fd)
+        with self._attr_lock:
+            self._attr_cache.pop(path, None)
 
     def readlink(self, path):
         raise FuseOSError(errno.ENOENT)
 
+    # Constant for the lifetime of the mount — built once, returned as-is.
+    _STATFS = {
+        "f_bsize": 4096,
+        "f_frsize": 4096,
+        "f_blocks": 0,
+        "f_bfree": 0,
+        "f_bavail": 0,
+        "f_files": 0,
+        "f_ffree": 0,
+        "f_favail": 0,
+        "f_namemax": 255,
+    }
+
     def statfs(self, path):
-        return {
-            "f_bsize": 4096,
-            "f_frsize": 4096,
-            "f_blocks": 0,
-            "f_bfree": 0,
-            "f_bavail": 0,
-            "f_files": 0,
-            "f_ffree": 0,
-            "f_favail": 0,
-            "f_namemax": 255,
-        }
+        return self._STATFS
 
     # ------------------------------------------------------------------
     # Write operations — all return EROFS (Read-only file system)
     # ------------------------------------------------------------------
 
-    def chmod(self, path, mode):
-        raise FuseOSError(errno.EROFS)
-
-    def chown(self, path, uid, gid):
-        raise FuseOSError(errno.EROFS)
-
-    def create(self, path, mode, fi=None):
-        raise FuseOSError(errno.EROFS)
-
-    def link(self, target, source):
-        raise FuseOSError(errno.EROFS)
-
-    def mkdir(self, path, mode):
-        raise FuseOSError(errno.EROFS)
-
-    def mknod(self, path, mode, dev):
-        raise FuseOSError(errno.EROFS)
-
-    def rename(self, old, new):
-        raise FuseOSError(errno.EROFS)
-
-    def rmdir(self, path):
-        raise FuseOSError(errno.EROFS)
-
-    def symlink(self, target, source):
-        raise FuseOSError(errno.EROFS)
-
-    def truncate(self, path, length, fh=None):
-        raise FuseOSError(errno.EROFS)
-
-    def unlink(self, path):
-        raise FuseOSError(errno.EROFS)
-
-    def utimens(self, path, times=None):
-        raise FuseOSError(errno.EROFS)
-
-    def write(self, path, data, offset, fh):
-        raise FuseOSError(errno.EROFS)
+    chmod = chown = create = link = mkdir = mknod = rename = rmdir = \
+        symlink = truncate = unlink = utimens = write = staticmethod(_erofs)
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import functools
 import logging
-import re
+import sys
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# datetime.fromisoformat accepts a trailing "Z" natively from 3.11 on.
+_NATIVE_Z = sys.version_info >= (3, 11)
+
+
+def _clean_iso(iso_str: str) -> str:
+    """Make an ISO string fromisoformat-safe, allocating only when needed."""
+    if _NATIVE_Z or not iso_str.endswith("Z"):
+        return iso_str
+    return iso_str[:-1] + "+00:00"
+
 
 def deduplicate_names(datasets) -> Dict[int, str]:
     """Map dataset IDs to unique display names for use as folder names.
@@ -21,61 +33,70 @@ def deduplicate_names(datasets) -> Dict[int, str]:
     Slashes and null bytes are replaced with underscores so names are safe
     for use as path components.
     """
-    # Build a list of (dataset, sanitized_name) pairs
-    entries: List[tuple] = []
+    # Group datasets by sanitized name in a single pass
+    name_groups: Dict[str, list] = defaultdict(list)
     for ds in datasets:
         raw_name = getattr(ds, "dataset_name", None) or f"dataset_{ds.id}"
-        entries.append((ds, _sanitize(raw_name)))
-
-    # Group by sanitized name
-    name_groups: Dict[str, list] = {}
-    for ds, safe_name in entries:
-        name_groups.setdefault(safe_name, []).append(ds)
+        name_groups[_sanitize(raw_name)].append(ds)
 
+    # Final names are interned: they become dict keys probed on every
+    # FUSE lookup, and interning makes those probes pointer-equality
+    # first.
+    intern = sys.intern
     result: Dict[int, str] = {}
     for name, group in name_groups.items():
         if len(group) == 1:
-            result[group[0].id] = name
+            result[group[0].id] = intern(name)
             continue
 
         # Collision — append formatted experiment_start_time
-        timestamped: Dict[str, list] = {}
+        timestamped: Dict[str, list] = defaultdict(list)
         for ds in group:
             ts_str = _format_timestamp(getattr(ds, "experiment_start_time", None))
             display = f"{name} ({ts_str})" if ts_str else name
-            timestamped.setdefault(display, []).append(ds)
+            timestamped[display].append(ds)
 
         for display, sub_group in timestamped.items():
             if len(sub_group) == 1:
-                result[sub_group[0].id] = display
+                result[sub_group[0].id] = intern(display)
             else:
                 # Timestamps also collide — fall back to ID
                 for ds in sub_group:
-                    result[ds.id] = f"{display} [{ds.id}]"
+                    result[ds.id] = intern(f"{display} [{ds.id}]")
 
     return result
 
 
+@functools.lru_cache(maxsize=4096)
 def _format_timestamp(iso_str: Optional[str]) -> Optional[str]:
     """Format an ISO timestamp as ``YYYY-MM-DD HH:MM`` for display in folder names."""
     if not iso_str:
         return None
     try:
-        cleaned = iso_str.replace("Z", "+00:00")
-        dt = datetime.fromisoformat(cleaned)
+        dt = datetime.fromisoformat(_clean_iso(iso_str))
         return dt.strftime("%Y-%m-%d %H:%M")
     except (ValueError, TypeError):
         return None
 
 
-_UNSAFE_RE = re.compile(r"[/\x00]")
+_SANITIZE_TABLE = str.maketrans({"/": "_", "\x00": "_"})
 
 
 def _sanitize(name: str) -> str:
     """Replace characters that are invalid in POSIX filenames."""
-    return _UNSAFE_RE.sub("_", name).strip()
+    return name.translate(_SANITIZE_TABLE).strip()
+
+
+def parse_iso_timestamps(iso_strs) -> List[float]:
+    """Parse an iterable of ISO-8601 strings to UNIX epoch floats.
+
+    Timestamps repeat heavily within a catalog listing; repeats are
+    served from :func:`parse_iso_timestamp`'s cache.
+    """
+    return [parse_iso_timestamp(s) for s in iso_strs]
 
 
+@functools.lru_cache(maxsize=8192)
 def parse_iso_timestamp(iso_str: Optional[str]) -> float:
     """Parse an ISO-8601 datetime string to a UNIX epoch float.
 
@@ -84,9 +105,7 @@ def parse_iso_timestamp(iso_str: Optional[str]) -> float:
     if not iso_str:
         return 0.0
     try:
-        # Python 3.11+ handles trailing Z; for earlier versions strip it.
-        cleaned = iso_str.replace("Z", "+00:00")
-        dt = datetime.fromisoformat(cleaned)
+        dt = datetime.fromisoformat(_clean_iso(iso_str))
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.timestamp()